@@ -1,5 +1,8 @@
+import atexit
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
 
+import math
 import numpy as np
 import inspect
 import os
@@ -9,11 +12,20 @@ import logging
 # TODO: Add options for mnu, h0 default, omega_b, etc
 
 
-@lru_cache(maxsize=32)
 def getCambGenerator(redshift=0.51, om_resolution=101, h0_resolution=1, h0=0.676, ob=0.04814, ns=0.97):
+    # Round the float arguments so that numerically identical cosmologies share a generator
+    return _getCambGenerator(round(redshift, 6), om_resolution, h0_resolution, round(h0, 6), round(ob, 6), round(ns, 6))
+
+
+@lru_cache(maxsize=None)
+def _getCambGenerator(redshift, om_resolution, h0_resolution, h0, ob, ns):
+    # Only a handful of configurations are used in a run, so the cache is unbounded
     return CambGenerator(redshift=redshift, om_resolution=om_resolution, h0_resolution=h0_resolution, h0=h0, ob=ob, ns=ns)
 
 
+atexit.register(lambda: logging.getLogger("barry").debug(f"CambGenerator cache usage: {_getCambGenerator.cache_info()}"))
+
+
 def Omega_m_z(omega_m, z):
     """
     Computes the matter density at redshift based on the present day value.
@@ -25,7 +37,8 @@ def Omega_m_z(omega_m, z):
     :param z: the redshift we want the matter density at
     :return: the matter density at redshift z
     """
-    return omega_m * (1.0 + z) ** 3 / E_z(omega_m, z) ** 2
+    matter = omega_m * (1.0 + z) ** 3
+    return matter / (matter + (1.0 - omega_m))
 
 
 def E_z(omega_m, z):
@@ -39,7 +52,58 @@ def E_z(omega_m, z):
     :param z: the redshift we want the E-function at
     :return: The E-function at redshift z given the matter density
     """
-    return np.sqrt((1.0 + z) ** 3 * omega_m + (1.0 - omega_m))
+    return np.sqrt(E2_z(omega_m, z))
+
+
+def E2_z(omega_m, z):
+    """
+    Compute the square of the E-function, avoiding the square root when only E(z)^2 is needed.
+
+    :param omega_m: the matter density at the present day
+    :param z: the redshift we want the E-function at
+    :return: The square of the E-function at redshift z given the matter density
+    """
+    return (1.0 + z) ** 3 * omega_m + (1.0 - omega_m)
+
+
+def _generate_point(task):
+    """ Runs CAMB for a single (omch2, h0) grid point, returning the sound horizon, linear and halofit power spectra.
+
+    Defined at module level so that it can be sent to worker processes by CambGenerator._generate_data.
+    """
+    i, j, omch2, h0, omega_b, ns, redshift, k_min, k_max, k_num = task
+    import camb
+
+    logging.getLogger("barry").debug("Generating %d:%d  %0.3f  %0.3f" % (i, j, omch2, h0))
+    pars = camb.CAMBparams()
+    pars.set_dark_energy(w=-1.0, dark_energy_model="fluid")
+    pars.InitPower.set_params(As=2.130e-9, ns=ns)
+    pars.set_matter_power(redshifts=[redshift, 0.0001], kmax=k_max)
+    pars.set_cosmology(
+        H0=h0 * 100,
+        omch2=omch2,
+        mnu=0.0,
+        ombh2=omega_b * h0 * h0,
+        omk=0.0,
+        tau=0.063,
+        neutrino_hierarchy="degenerate",
+        num_massive_neutrinos=1,
+    )
+    pars.NonLinear = camb.model.NonLinear_none
+    results = camb.get_results(pars)
+    params = results.get_derived_params()
+    rdrag = params["rdrag"]
+    kh, z, pk_lin = results.get_matter_power_spectrum(minkh=k_min, maxkh=k_max, npoints=k_num)
+    pars.NonLinear = camb.model.NonLinear_pk
+    results.calc_power_spectra(pars)
+    kh, z, pk_nonlin = results.get_matter_power_spectrum(minkh=k_min, maxkh=k_max, npoints=k_num)
+
+    # Layout is [rdrag, pk_lin(z), pk_nonlin(z=0), pk_nonlin(z)], written directly without temporary copies
+    row = np.empty(1 + 3 * k_num)
+    row[0] = rdrag
+    row[1 : 1 + k_num] = pk_lin[1, :]
+    np.copyto(row[1 + k_num :].reshape(2, k_num), pk_nonlin)
+    return i, j, row
 
 
 class CambGenerator(object):
@@ -78,6 +142,9 @@ class CambGenerator(object):
             self.h0s = np.linspace(0.6, 0.8, self.h0_resolution)
 
         self.data = None
+        self._rdrag = None
+        self._pk_lin = None
+        self._pk_nonlin = None
         self.logger.info(f"Creating CAMB data with {self.om_resolution} x {self.h0_resolution}")
 
     def load_data(self, can_generate=False):
@@ -90,61 +157,73 @@ class CambGenerator(object):
                 self.data = self._generate_data()
         else:
             self.logger.info("Loading existing CAMB data")
-            self.data = np.load(self.filename)
+            # Stored as single precision to halve the memory read per interpolation, older double precision files are converted
+            self.data = np.load(self.filename).astype(np.float32, copy=False)
+        # Per quantity views over the flattened (om, h0) grid, so interpolation only reads the quantity requested
+        data_flat = self.data.reshape(self.om_resolution * self.h0_resolution, -1)
+        self._rdrag = data_flat[:, 0]
+        self._pk_lin = data_flat[:, 1 : 1 + self.k_num]
+        self._pk_nonlin = data_flat[:, 1 + 2 * self.k_num :]
 
-    @lru_cache(maxsize=512)
     def get_data(self, om=0.31, h0=None):
         """ Returns the sound horizon, the linear power spectrum, and the halofit power spectrum at self.redshift"""
         if h0 is None:
             h0 = self.h0
+        # Round the cache key so that numerically identical cosmologies share an entry
+        return self._get_data_cached(round(om, 6), round(h0, 6))
+
+    def get_pk_lin(self, om=0.31, h0=None):
+        """ Returns only the linear power spectrum at self.redshift, without interpolating the other quantities """
+        if h0 is None:
+            h0 = self.h0
+        return self._get_pk_lin_cached(round(om, 6), round(h0, 6))
+
+    def get_data_cache_info(self):
+        """ Returns the hit and miss statistics of the get_data and get_pk_lin caches.
+
+        These caches are shared by every CambGenerator in the process, so the statistics are process-wide.
+        """
+        return {"get_data": self._get_data_cached.cache_info(), "get_pk_lin": self._get_pk_lin_cached.cache_info()}
+
+    @lru_cache(maxsize=512)
+    def _get_data_cached(self, om, h0):
         if self.data is None:
             self.load_data()
-        omch2 = (om - self.omega_b) * h0 * h0
-        data = self._interpolate(omch2, h0)
-        return data[0], data[1 : 1 + self.k_num], data[1 + 2 * self.k_num :]
+        weights, index = self._get_interpolation_weights((om - self.omega_b) * h0 * h0, h0)
+        return weights @ self._rdrag[index], weights @ self._pk_lin[index], weights @ self._pk_nonlin[index]
+
+    @lru_cache(maxsize=512)
+    def _get_pk_lin_cached(self, om, h0):
+        if self.data is None:
+            self.load_data()
+        weights, index = self._get_interpolation_weights((om - self.omega_b) * h0 * h0, h0)
+        return weights @ self._pk_lin[index]
 
     def _generate_data(self):
         self.logger.info(f"Generating CAMB data with {self.om_resolution} x {self.h0_resolution}")
         os.makedirs(self.data_dir, exist_ok=True)
-        import camb
-
-        pars = camb.CAMBparams()
-        pars.set_dark_energy(w=-1.0, dark_energy_model="fluid")
-        pars.InitPower.set_params(As=2.130e-9, ns=self.ns)
-        pars.set_matter_power(redshifts=[self.redshift, 0.0001], kmax=self.k_max)
-        self.logger.info("Configured CAMB power and dark energy")
-
-        data = np.zeros((self.om_resolution, self.h0_resolution, 1 + 3 * self.k_num))
-        for i, omch2 in enumerate(self.omch2s):
-            for j, h0 in enumerate(self.h0s):
-                self.logger.debug("Generating %d:%d  %0.3f  %0.3f" % (i, j, omch2, h0))
-                pars.set_cosmology(
-                    H0=h0 * 100,
-                    omch2=omch2,
-                    mnu=0.0,
-                    ombh2=self.omega_b * h0 * h0,
-                    omk=0.0,
-                    tau=0.063,
-                    neutrino_hierarchy="degenerate",
-                    num_massive_neutrinos=1,
-                )
-                pars.NonLinear = camb.model.NonLinear_none
-                results = camb.get_results(pars)
-                params = results.get_derived_params()
-                rdrag = params["rdrag"]
-                kh, z, pk_lin = results.get_matter_power_spectrum(minkh=self.k_min, maxkh=self.k_max, npoints=self.k_num)
-                pars.NonLinear = camb.model.NonLinear_pk
-                results.calc_power_spectra(pars)
-                kh, z, pk_nonlin = results.get_matter_power_spectrum(minkh=self.k_min, maxkh=self.k_max, npoints=self.k_num)
-                data[i, j, 0] = rdrag
-                data[i, j, 1 : 1 + self.k_num] = pk_lin[1, :]
-                data[i, j, 1 + self.k_num :] = pk_nonlin.flatten()
+
+        # Every grid point is independent, so farm the CAMB calls out across all available cores
+        tasks = [
+            (i, j, omch2, h0, self.omega_b, self.ns, self.redshift, self.k_min, self.k_max, self.k_num)
+            for i, omch2 in enumerate(self.omch2s)
+            for j, h0 in enumerate(self.h0s)
+        ]
+        data = np.empty((self.om_resolution, self.h0_resolution, 1 + 3 * self.k_num))
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for i, j, row in executor.map(_generate_point, tasks):
+                data[i, j] = row
         self.logger.info(f"Saving to {self.filename}")
+        data = data.astype(np.float32)
         np.save(self.filename, data)
         return data
 
-    def _interpolate(self, omch2, h0):
-        """ Performs bilinear interpolation on the entire pk array """
+    def _get_interpolation_weights(self, omch2, h0):
+        """ Returns the bilinear interpolation weights and the matching corner indices into the flattened (om, h0) grid.
+
+        The interpolated value of any quantity is then weights @ quantity[index], accumulated in double precision
+        even though the table itself is single precision.
+        """
         omch2_index = 1.0 * (self.om_resolution - 1) * (omch2 - self.omch2s[0]) / (self.omch2s[-1] - self.omch2s[0])
 
         if self.h0_resolution == 1:
@@ -152,20 +231,21 @@ class CambGenerator(object):
         else:
             h0_index = 1.0 * (self.h0_resolution - 1) * (h0 - self.h0s[0]) / (self.h0s[-1] - self.h0s[0])
 
-        x = omch2_index - np.floor(omch2_index)
-        y = h0_index - np.floor(h0_index)
+        ix = math.floor(omch2_index)
+        iy = math.floor(h0_index)
+        x = omch2_index - ix
+        y = h0_index - iy
 
-        data = self.data
-        v1 = data[int(np.floor(omch2_index)), int(np.floor(h0_index))]  # 00
-        v2 = data[int(np.ceil(omch2_index)), int(np.floor(h0_index))]  # 01
+        # Bilinear weights, sharing the (1 - x) and x factors between both h0 rows
+        wx = [1 - x, x]
+        weights = np.array([wx[0] * (1 - y), wx[1] * (1 - y), wx[0] * y, wx[1] * y])
 
-        if self.h0_resolution == 1:
-            final = v1 * (1 - x) * (1 - y) + v2 * x * (1 - y)
-        else:
-            v3 = data[int(np.floor(omch2_index)), int(np.ceil(h0_index))]  # 10
-            v4 = data[int(np.ceil(omch2_index)), int(np.ceil(h0_index))]  # 11
-            final = v1 * (1 - x) * (1 - y) + v2 * x * (1 - y) + v3 * y * (1 - x) + v4 * x * y
-        return final
+        # Corner indices into the flattened grid, the upper corner collapses onto the lower one at the grid edge
+        ix1 = min(ix + 1, self.om_resolution - 1)
+        iy1 = min(iy + 1, self.h0_resolution - 1)
+        index = [ix * self.h0_resolution + iy, ix1 * self.h0_resolution + iy, ix * self.h0_resolution + iy1, ix1 * self.h0_resolution + iy1]
+
+        return weights, index
 
 
 def test_rand_h0const():
@@ -1,8 +1,7 @@
 from abc import ABC
 
 import numpy as np
-from scipy.integrate import trapz
-from scipy.interpolate import interp1d, splev, splrep
+from scipy.interpolate import interp1d
 
 
 class PowerToCorrelation(ABC):
@@ -42,21 +41,74 @@ class PowerToCorrelationGauss(PowerToCorrelation):
         self.ks2 = np.logspace(np.log(np.min(ks)), np.log(np.max(ks)), interpolateDetail * ks.size, base=np.e)
         self.precomp = self.ks2 * np.exp(-self.ks2 * self.ks2 * a * a) / (2 * np.pi * np.pi)  # Precomp a bunch of things
 
-    def __call__(self, ks, pks, ss):
-        pks2 = interp1d(ks, pks, kind="linear")(self.ks2)
-        # Set up output array
-        xis = np.zeros(ss.size)
+        # Trapezoidal integration weights over ks2, so that trapz(y, ks2) == trap_w @ y
+        self.trap_w = np.empty_like(self.ks2)
+        self.trap_w[1:-1] = 0.5 * (self.ks2[2:] - self.ks2[:-2])
+        self.trap_w[0] = 0.5 * (self.ks2[1] - self.ks2[0])
+        self.trap_w[-1] = 0.5 * (self.ks2[-1] - self.ks2[-2])
+
+        # Linear interpolation indices and weights from ks onto ks2, as ks is fixed across calls
+        self._idx = np.clip(np.searchsorted(self.ks, self.ks2) - 1, 0, self.ks.size - 2)
+        self._w = (self.ks2 - self.ks[self._idx]) / (self.ks[self._idx + 1] - self.ks[self._idx])
+
+        # k^2, gauss and integration weights combined (note missing a ks factor because integrating in log space)
+        self._precomp_trap = self.precomp * self.trap_w
 
-        # Precompute k^2 and gauss (note missing a ks factor below because integrating in log space)
-        kkpks = self.precomp * pks2
+        # Scratch buffers reused across calls
+        self._pks2 = np.empty_like(self.ks2)
+        self._integrand = np.empty_like(self.ks2)
 
-        # Iterate over all values in desired output array of distances (s)
-        for i, s in enumerate(ss):
-            integrand = kkpks * np.sin(self.ks2 * s) / s
-            xis[i] = trapz(integrand, self.ks2)
+        # The sin(ks2 * s) matrix for the most recently requested distances, overwritten in place when they change
+        self._sin_key = None
+        self._sin = None
+
+    def __call__(self, ks, pks, ss):
+        if ks is self.ks or np.array_equal(ks, self.ks):
+            # The scratch buffers are float64, so gather from a float64 copy of lower precision inputs such as the camb table
+            pks = np.asarray(pks, dtype=np.float64)
+            pks2 = np.take(pks, self._idx + 1, out=self._pks2)
+            pks2 -= np.take(pks, self._idx, out=self._integrand)
+            pks2 *= self._w
+            pks2 += self._integrand
+        else:
+            pks2 = interp1d(ks, pks, kind="linear")(self.ks2)
+
+        kkpks = np.multiply(self._precomp_trap, pks2, out=self._integrand)
+
+        # Integrate for all values in desired output array of distances (s) at once, reusing the sin matrix if
+        # the distances are unchanged since the last call
+        key = ss.tobytes()
+        if key != self._sin_key:
+            self._fill_sin(ss)
+            self._sin_key = key
+        xis = self._sin @ kkpks
+        xis /= ss
 
         return xis
 
+    def _fill_sin(self, ss):
+        """ Fills the sin(ks2 * s) matrix for the given distances
+
+        The distances are normally evenly spaced bins scaled by alpha, in which case only the first two rows are
+        evaluated directly and the rest follow from sin(k (s + ds)) = 2 cos(k ds) sin(k s) - sin(k (s - ds)).
+        """
+        if self._sin is None or self._sin.shape[0] != ss.size:
+            self._sin = np.empty((ss.size, self.ks2.size))
+        sin = self._sin
+
+        ds = np.diff(ss)
+        if ss.size < 3 or not np.allclose(ds, ds[0], rtol=1e-10, atol=0):
+            np.multiply.outer(ss, self.ks2, out=sin)
+            np.sin(sin, out=sin)
+            return
+
+        np.multiply.outer(ss[:2], self.ks2, out=sin[:2])
+        np.sin(sin[:2], out=sin[:2])
+        cos2 = 2.0 * np.cos(ds[0] * self.ks2)
+        for i in range(2, ss.size):
+            np.multiply(cos2, sin[i - 1], out=sin[i])
+            sin[i] -= sin[i - 2]
+
 
 class PowerToCorrelationFT(PowerToCorrelation):
     """ A pk2xi implementation utilising the Hankel library to use explicit FFT.
@@ -77,8 +129,16 @@ class PowerToCorrelationFT(PowerToCorrelation):
         self.ft = SymmetricFourierTransform(ndim=3, N=num_nodes, h=h)
 
     def __call__(self, ks, pk, ss):
-        pkspline = splrep(ks, pk)
-        f = lambda k: splev(k, pkspline)
+        log_ks = np.log(ks)
+
+        def f(k):
+            # Linear interpolation in log k, extrapolating linearly beyond the ends of ks
+            log_k = np.log(k)
+            pos = np.searchsorted(log_ks, log_k) - 1
+            np.clip(pos, 0, ks.size - 2, out=pos)
+            w = (log_k - log_ks[pos]) / (log_ks[pos + 1] - log_ks[pos])
+            return (1.0 - w) * pk[pos] + w * pk[pos + 1]
+
         xi = self.ft.transform(f, ss, inverse=True, ret_err=False)
         return xi
 
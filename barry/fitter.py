@@ -154,6 +154,9 @@ class Fitter(object):
         self.logger.info(f"\tData is {' '.join([d['name'] for d in self.model_datasets[model_index][1]])}")
         sampler.fit(model.get_posterior, model.get_start, model.get_num_dim(), model.unscale, uid=uid, save_dims=self.save_dims)
         self.logger.info("Finished sampling")
+        if getattr(model, "camb", None) is not None:
+            for name, info in model.camb.get_data_cache_info().items():
+                self.logger.info(f"CAMB {name} cache usage (all generators in this process): {info}")
 
     def is_local(self):
         return shutil.which(get_config()["hpc_determining_command"]) is None
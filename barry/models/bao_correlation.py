@@ -1,4 +1,3 @@
-from functools import lru_cache
 import numpy as np
 
 from barry.cosmology.PT_generator import getCambGeneratorAndPT
@@ -42,6 +41,11 @@ class CorrelationFunctionFit(Model):
         self.pk2xi = None
         self.recon_smoothing_scale = None
         self.cosmology = None
+        self.clear_caches()
+
+    def clear_caches(self):
+        """ Empties the per-instance caches, which depend on the cosmology set in `set_data` """
+        self._basic_power_spectrum_cache = {}
 
     def set_data(self, data):
         """ Sets the models data, including fetching the right cosmology and PT generator.
@@ -55,6 +59,8 @@ class CorrelationFunctionFit(Model):
             A list of datas to use
         """
         super().set_data(data)
+        # Uncertainties on the first data set for plotting, np.diagonal returns a view rather than a copy of the diagonal
+        self._err = np.sqrt(np.diagonal(self.data[0]["cov"]))
         c = data[0]["cosmology"]
         z = c["z"]
         if self.param_dict.get("f") is not None:
@@ -66,6 +72,7 @@ class CorrelationFunctionFit(Model):
             )
             self.pk2xi = PowerToCorrelationGauss(self.camb.ks)
             self.set_default("om", c["om"])
+            self.clear_caches()
 
     def declare_parameters(self):
         """ Defines model parameters, their bounds and default value. """
@@ -73,7 +80,6 @@ class CorrelationFunctionFit(Model):
         self.add_param("alpha", r"$\alpha$", 0.8, 1.2, 1.0)  # Stretch
         self.add_param("b", r"$b$", 0.01, 10.0, 1.0)  # Linear galaxy bias
 
-    @lru_cache(maxsize=1024)
     def compute_basic_power_spectrum(self, om):
         """ Computes the smoothed linear power spectrum and the wiggle ratio.
 
@@ -92,11 +98,13 @@ class CorrelationFunctionFit(Model):
             pk_ratio_dewiggled - the ratio pk_lin / pk_smooth
 
         """
-        # Get base linear power spectrum from camb
-        r_s, pk_lin, _ = self.camb.get_data(om=om, h0=self.camb.h0)
-        pk_smooth_lin = smooth(self.camb.ks, pk_lin, method=self.smooth_type, om=om, h0=self.camb.h0)  # Get the smoothed power spectrum
-        pk_ratio = pk_lin / pk_smooth_lin - 1.0  # Get the ratio
-        return pk_smooth_lin, pk_ratio
+        if om not in self._basic_power_spectrum_cache:
+            # Get base linear power spectrum from camb
+            pk_lin = self.camb.get_pk_lin(om=om, h0=self.camb.h0)
+            pk_smooth_lin = smooth(self.camb.ks, pk_lin, method=self.smooth_type, om=om, h0=self.camb.h0)  # Get the smoothed power spectrum
+            pk_ratio = pk_lin / pk_smooth_lin - 1.0  # Get the ratio
+            self.add_to_cache(self._basic_power_spectrum_cache, om, (pk_smooth_lin, pk_ratio), maxsize=1024)
+        return self._basic_power_spectrum_cache[om]
 
     def compute_correlation_function(self, dist, p, smooth=False):
         """ Computes the correlation function at distance d given the supplied params
@@ -173,7 +181,7 @@ class CorrelationFunctionFit(Model):
 
         ss = self.data[0]["dist"]
         xi = self.data[0]["xi0"]
-        err = np.sqrt(np.diag(self.data[0]["cov"]))
+        err = self._err
         xi2 = self.get_model(params, self.data[0])
 
         if smooth_params is not None:
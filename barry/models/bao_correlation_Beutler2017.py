@@ -10,6 +10,11 @@ class CorrBeutler2017(CorrelationFunctionFit):
     def __init__(self, name="Corr Beutler 2017", smooth_type="hinton2017", fix_params=("om"), smooth=False, correction=None):
         super().__init__(name, smooth_type, fix_params, smooth, correction=correction)
 
+    def set_data(self, data):
+        super().set_data(data)
+        self._ks2 = self.camb.ks ** 2
+        self._pk_dewiggled = np.empty(self.camb.ks.size)
+
     def declare_parameters(self):
         # Define parameters
         super().declare_parameters()
@@ -27,8 +32,12 @@ class CorrBeutler2017(CorrelationFunctionFit):
         if smooth:
             pk_dewiggled = pk_smooth
         else:
-            pk_linear_weight = np.exp(-0.5 * (ks * p["sigma_nl"]) ** 2)
-            pk_dewiggled = (pk_linear_weight * (1 + pk_ratio_dewiggled) + (1 - pk_linear_weight)) * pk_smooth
+            # Equivalent to (w * (1 + pk_ratio) + (1 - w)) * pk_smooth with w = exp(-k^2 sigma_nl^2 / 2), computed in place
+            pk_dewiggled = np.multiply(self._ks2, -0.5 * p["sigma_nl"] ** 2, out=self._pk_dewiggled)
+            np.exp(pk_dewiggled, out=pk_dewiggled)
+            pk_dewiggled *= pk_ratio_dewiggled
+            pk_dewiggled += 1.0
+            pk_dewiggled *= pk_smooth
 
         # Convert to correlation function and take alpha into account
         xi = self.pk2xi(ks, pk_dewiggled, d * p["alpha"])
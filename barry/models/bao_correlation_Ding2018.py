@@ -23,6 +23,7 @@ class CorrDing2018(CorrelationFunctionFit):
         self.fit_growth = fix_params is None or "f" not in fix_params
         self.nmu = 100
         self.mu = np.linspace(0.0, 1.0, self.nmu)
+        self._mu2 = self.mu ** 2
         self.smoothing_kernel = None
 
     @lru_cache(maxsize=32)
@@ -31,11 +32,11 @@ class CorrDing2018(CorrelationFunctionFit):
 
     @lru_cache(maxsize=32)
     def get_damping_dd(self, growth, om):
-        return np.exp(-np.outer(1.0 + (2.0 + growth) * growth * self.mu ** 2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma_dd_nl"])
+        return np.exp(-np.outer(1.0 + (2.0 + growth) * growth * self._mu2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma_dd_nl"])
 
     @lru_cache(maxsize=32)
     def get_damping_sd(self, growth, om):
-        return np.exp(-np.outer(1.0 + growth * self.mu ** 2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma_dd_nl"])
+        return np.exp(-np.outer(1.0 + growth * self._mu2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma_dd_nl"])
 
     @lru_cache(maxsize=32)
     def get_damping_ss(self, om):
@@ -43,7 +44,7 @@ class CorrDing2018(CorrelationFunctionFit):
 
     @lru_cache(maxsize=32)
     def get_damping(self, growth, om):
-        return np.exp(-np.outer(1.0 + (2.0 + growth) * growth * self.mu ** 2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma_nl"])
+        return np.exp(-np.outer(1.0 + (2.0 + growth) * growth * self._mu2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma_nl"])
 
     def set_data(self, data):
         super().set_data(data)
@@ -97,7 +98,7 @@ class CorrDing2018(CorrelationFunctionFit):
 
             smooth_prefac = np.tile(self.smoothing_kernel / p["b"], (self.nmu, 1))
             bdelta_prefac = np.tile(0.5 * p["b_delta"] / p["b"] * ks ** 2, (self.nmu, 1))
-            kaiser_prefac = 1.0 - smooth_prefac + np.outer(growth / p["b"] * self.mu ** 2, 1.0 - self.smoothing_kernel) + bdelta_prefac
+            kaiser_prefac = 1.0 - smooth_prefac + np.outer(growth / p["b"] * self._mu2, 1.0 - self.smoothing_kernel) + bdelta_prefac
             propagator = (
                 (kaiser_prefac ** 2 - bdelta_prefac ** 2) * damping_dd + 2.0 * kaiser_prefac * smooth_prefac * damping_sd + smooth_prefac ** 2 * damping_ss
             )
@@ -105,11 +106,11 @@ class CorrDing2018(CorrelationFunctionFit):
             damping = self.get_damping(growth, om)
 
             bdelta_prefac = np.tile(0.5 * p["b_delta"] / p["b"] * ks ** 2, (self.nmu, 1))
-            kaiser_prefac = 1.0 + np.tile(growth / p["b"] * self.mu ** 2, (len(ks), 1)).T + bdelta_prefac
+            kaiser_prefac = 1.0 + np.tile(growth / p["b"] * self._mu2, (len(ks), 1)).T + bdelta_prefac
             propagator = (kaiser_prefac ** 2 - bdelta_prefac ** 2) * damping
 
         # Compute the smooth model
-        fog = 1.0 / (1.0 + np.outer(self.mu ** 2, ks ** 2 * p["sigma_s"] ** 2 / 2.0)) ** 2
+        fog = 1.0 / (1.0 + np.outer(self._mu2, ks ** 2 * p["sigma_s"] ** 2 / 2.0)) ** 2
         pk_smooth = p["b"] ** 2 * pk_smooth_lin * fog
 
         # Integrate over mu
@@ -1,5 +1,3 @@
-from functools import lru_cache
-
 from scipy.interpolate import splev, splrep
 
 from barry.cosmology.PT_generator import getCambGeneratorAndPT
@@ -44,6 +42,11 @@ class PowerSpectrumFit(Model):
         self.PT = None
         self.recon_smoothing_scale = None
         self.cosmology = None
+        self.clear_caches()
+
+    def clear_caches(self):
+        """ Empties the per-instance caches, which depend on the cosmology set in `set_data` """
+        self._basic_power_spectrum_cache = {}
 
     def set_data(self, data):
         """ Sets the models data, including fetching the right cosmology and PT generator.
@@ -57,6 +60,8 @@ class PowerSpectrumFit(Model):
             A list of datas to use
         """
         super().set_data(data)
+        # Uncertainties on the first data set for plotting, np.diagonal returns a view rather than a copy of the diagonal
+        self._err = np.sqrt(np.diagonal(self.data[0]["cov"]))
         c = data[0]["cosmology"]
         z = c["z"]
         if self.param_dict.get("f") is not None:
@@ -67,6 +72,7 @@ class PowerSpectrumFit(Model):
                 h0=c["h0"], ob=c["ob"], redshift=c["z"], ns=c["ns"], smooth_type=self.smooth_type, recon_smoothing_scale=self.recon_smoothing_scale
             )
             self.set_default("om", c["om"])
+            self.clear_caches()
 
     def declare_parameters(self):
         """ Defines model parameters, their bounds and default value. """
@@ -74,7 +80,6 @@ class PowerSpectrumFit(Model):
         self.add_param("alpha", r"$\alpha$", 0.8, 1.2, 1.0)  # Stretch
         self.add_param("b", r"$b$", 0.1, 12.5, 1.73)  # bias
 
-    @lru_cache(maxsize=1024)
     def compute_basic_power_spectrum(self, om):
         """ Computes the smoothed linear power spectrum and the wiggle ratio
 
@@ -91,11 +96,13 @@ class PowerSpectrumFit(Model):
             the ratio pk_lin / pk_smooth, transitioned using sigma_nl
 
         """
-        # Get base linear power spectrum from camb
-        r_s, pk_lin, _ = self.camb.get_data(om=om, h0=self.camb.h0)
-        pk_smooth_lin = smooth(self.camb.ks, pk_lin, method=self.smooth_type, om=om, h0=self.camb.h0)  # Get the smoothed power spectrum
-        pk_ratio = pk_lin / pk_smooth_lin - 1.0  # Get the ratio
-        return pk_smooth_lin, pk_ratio
+        if om not in self._basic_power_spectrum_cache:
+            # Get base linear power spectrum from camb
+            pk_lin = self.camb.get_pk_lin(om=om, h0=self.camb.h0)
+            pk_smooth_lin = smooth(self.camb.ks, pk_lin, method=self.smooth_type, om=om, h0=self.camb.h0)  # Get the smoothed power spectrum
+            pk_ratio = pk_lin / pk_smooth_lin - 1.0  # Get the ratio
+            self.add_to_cache(self._basic_power_spectrum_cache, om, (pk_smooth_lin, pk_ratio), maxsize=1024)
+        return self._basic_power_spectrum_cache[om]
 
     def compute_power_spectrum(self, k, p, smooth=False):
         """ Returns the wiggle ratio interpolated at some k/alpha values. Useful if we only want alpha to modify
@@ -197,7 +204,24 @@ class PowerSpectrumFit(Model):
         """
         # Get the generic pk model
         pk_generated = self.compute_power_spectrum(d["ks_input"], p, smooth=smooth)
-        # Morph it into a model representative of our survey and its selection/window/binning effects
+        return self.apply_survey_effects(pk_generated, d)
+
+    def apply_survey_effects(self, pk_generated, d):
+        """ Morphs a generated power spectrum into a model representative of our survey and its selection/window/binning effects
+
+        Parameters
+        ----------
+        pk_generated : np.ndarray
+            The p(k) values generated at the window function input ks, d['ks_input']
+        d : dict
+            A specific set of data to compute the model for
+
+        Returns
+        -------
+        pk_model : np.ndarray
+            The p(k) predictions, k values correspond to d['ks_output']
+
+        """
         pk_model, mask = self.adjust_model_window_effects(pk_generated, d)
 
         if self.postprocess is not None:
@@ -211,7 +235,7 @@ class PowerSpectrumFit(Model):
 
         ks = self.data[0]["ks"]
         pk = self.data[0]["pk"]
-        err = np.sqrt(np.diag(self.data[0]["cov"]))
+        err = self._err
         pk2 = self.get_model(params, self.data[0])
 
         if smooth_params is not None:
@@ -1,6 +1,5 @@
 import logging
 import numpy as np
-from scipy.interpolate import splev, splrep
 from barry.models.bao_power import PowerSpectrumFit
 
 
@@ -16,6 +15,21 @@ class PowerBeutler2017(PowerSpectrumFit):
 
         self.recon = recon
 
+    def set_data(self, data):
+        super().set_data(data)
+        # Precompute the powers of k used by the polynomial shape, so no divisions are needed per call
+        ks = self.camb.ks
+        self._ks2 = ks ** 2
+        self._ks_poly = self._ks2 if self.recon else ks
+        self._ks_inv = 1.0 / ks
+        self._ks_inv2 = self._ks_inv * self._ks_inv
+        self._ks_inv3 = self._ks_inv * self._ks_inv2
+
+        # Scratch buffers reused across likelihood calls
+        self._C = np.empty(ks.size)
+        self._pk_smooth = np.empty(ks.size)
+        self._shape = np.empty(ks.size)
+
     def declare_parameters(self):
         super().declare_parameters()
         self.add_param("sigma_nl", r"$\Sigma_{nl}$", 0.01, 20.0, 10.0)  # BAO damping
@@ -49,25 +63,57 @@ class PowerBeutler2017(PowerSpectrumFit):
         ks = self.camb.ks
         pk_smooth_lin, pk_ratio = self.compute_basic_power_spectrum(p["om"])
 
-        # Compute the propagator
-        C = np.exp(-0.5 * ks ** 2 * p["sigma_nl"] ** 2)
+        # Compute the propagator, folding the scalar coefficients together before touching the k array
+        C = np.multiply(self._ks2, -0.5 * p["sigma_nl"] ** 2, out=self._C)
+        np.exp(C, out=C)
+
+        # Compute the smooth model, b^2 * pk_smooth_lin / (1 + k^2 sigma_s^2 / 2)^2
+        pk_smooth = np.multiply(self._ks2, 0.5 * p["sigma_s"] ** 2, out=self._pk_smooth)
+        pk_smooth += 1.0
+        np.square(pk_smooth, out=pk_smooth)
+        np.divide(pk_smooth_lin, pk_smooth, out=pk_smooth)
+        pk_smooth *= p["b"] ** 2
+
+        # Polynomial shape, accumulated in place
+        shape = np.multiply(self._ks_inv3, p["a5"], out=self._shape)
+        shape += p["a4"] * self._ks_inv2
+        shape += p["a3"] * self._ks_inv
+        shape += p["a2"]
+        shape += p["a1"] * self._ks_poly
+
+        pk_model = shape
+        pk_model += pk_smooth
+        if not smooth:
+            C *= pk_ratio
+            C += 1.0
+            pk_model *= C
+        pk_final = self.interpolate_log_ks(k / p["alpha"], pk_model)
 
-        # Compute the smooth model
-        fog = 1.0 / (1.0 + ks ** 2 * p["sigma_s"] ** 2 / 2.0) ** 2
-        pk_smooth = p["b"] ** 2 * pk_smooth_lin * fog
+        return pk_final
 
-        # Polynomial shape
-        if self.recon:
-            shape = p["a1"] * ks ** 2 + p["a2"] + p["a3"] / ks + p["a4"] / (ks * ks) + p["a5"] / (ks ** 3)
-        else:
-            shape = p["a1"] * ks + p["a2"] + p["a3"] / ks + p["a4"] / (ks * ks) + p["a5"] / (ks ** 3)
+    def interpolate_log_ks(self, k, pk):
+        """ Linearly interpolates pk, defined on the log spaced camb ks, at the requested k values
 
-        if smooth:
-            pk_final = splev(k / p["alpha"], splrep(ks, pk_smooth + shape))
-        else:
-            pk_final = splev(k / p["alpha"], splrep(ks, (pk_smooth + shape) * (1.0 + pk_ratio * C)))
+        As the camb ks are uniform in log space, the bracketing indices and weights are computed directly
+        rather than fitting a spline to pk on every call.
 
-        return pk_final
+        Parameters
+        ----------
+        k : np.ndarray
+            Array of wavenumbers to interpolate to
+        pk : np.ndarray
+            The power spectrum evaluated at self.camb.ks
+
+        Returns
+        -------
+        array
+            pk_interp - The power spectrum at k
+        """
+        ks = self.camb.ks
+        pos = np.log(k / ks[0]) / np.log(ks[1] / ks[0])
+        index = np.clip(pos.astype(int), 0, ks.size - 2)
+        w = pos - index
+        return (1.0 - w) * pk[index] + w * pk[index + 1]
 
 
 if __name__ == "__main__":
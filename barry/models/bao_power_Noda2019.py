@@ -1,8 +1,7 @@
 import logging
-from functools import lru_cache
 
 import numpy as np
-from scipy.interpolate import splev, splrep
+from scipy.interpolate import CubicSpline
 from scipy import integrate
 from barry.models.bao_power import PowerSpectrumFit
 from barry.cosmology.camb_generator import Omega_m_z
@@ -40,6 +39,12 @@ class PowerNoda2019(PowerSpectrumFit):
 
         self.nmu = 100
         self.mu = np.linspace(0.0, 1.0, self.nmu)
+        self._mu2 = self.mu ** 2
+        self._mu2m1 = self._mu2 * (self._mu2 - 1.0)
+        # Simpson's rule weights over mu, so that simps(y, mu, axis=0) == simps_w @ y without re-deriving them each call
+        self._simps_w = integrate.simps(np.eye(self.nmu), self.mu, axis=0)
+        # The Simpson integrals of mu^0, mu^2 and mu^4, which are all the non-linear terms need
+        self._simps_mu024 = self._simps_w @ np.power.outer(self.mu, [0, 2, 4])
         self.smoothing_kernel = None
 
         self.nonlinear_type = nonlinear_type.lower()
@@ -54,34 +59,66 @@ class PowerNoda2019(PowerSpectrumFit):
             logging.getLogger("barry").error(f"Smoothing method is {self.nonlinear_type} and not in list {types}")
             return False
 
-    @lru_cache(maxsize=32)
     def get_pt_data(self, om):
-        return self.PT.get_data(om=om)
+        if om not in self._pt_cache:
+            self.add_to_cache(self._pt_cache, om, self.PT.get_data(om=om), maxsize=32)
+        return self._pt_cache[om]
 
-    @lru_cache(maxsize=32)
     def get_damping(self, growth, om, gamma):
-        return np.exp(
-            -np.outer(
-                (1.0 + (2.0 + growth) * growth * self.mu ** 2) * self.get_pt_data(om)["sigma_dd_rs"]
-                + (growth * self.mu ** 2 * (self.mu ** 2 - 1.0)) * self.get_pt_data(om)["sigma_ss_rs"],
-                self.camb.ks ** 2,
-            )
-            / gamma
-        )
+        key = (growth, om, gamma)
+        if key not in self._damping_cache:
+            pt_data = self.get_pt_data(om)
+            # Fold the -1/gamma scaling into the mu vector before forming the (nmu, nk) outer product
+            damping_mu = (1.0 + (2.0 + growth) * growth * self._mu2) * pt_data["sigma_dd_rs"] + growth * self._mu2m1 * pt_data["sigma_ss_rs"]
+            # Exponentiate in place, as the outer product is a fresh array that the cache takes ownership of
+            propagator = np.outer(damping_mu * (-1.0 / gamma), self._ks2)
+            self.add_to_cache(self._damping_cache, key, np.exp(propagator, out=propagator), maxsize=32)
+        return self._damping_cache[key]
+
+    def get_fog(self, A):
+        if A not in self._fog_cache:
+            self.add_to_cache(self._fog_cache, A, np.exp(-A * self._ks2), maxsize=1024)
+        return self._fog_cache[A]
 
-    @lru_cache(maxsize=32)
     def get_nonlinear(self, growth, om):
-        return (
-            self.get_pt_data(om)["Pdd_" + self.nonlinear_type],
-            np.outer(2.0 * growth * self.mu ** 2, self.get_pt_data(om)["Pdt_" + self.nonlinear_type]),
-            np.outer((growth * self.mu ** 2) ** 2, self.get_pt_data(om)["Ptt_" + self.nonlinear_type]),
-        )
+        """ Returns the mu-integrated non-linear P_dd, P_dt and P_tt terms, before dividing by the bias """
+        key = (growth, om)
+        if key not in self._nonlinear_cache:
+            pt_data = self.get_pt_data(om)
+            simps_mu0, simps_mu2, simps_mu4 = self._simps_mu024
+            nonlinear = (
+                simps_mu0 * pt_data["Pdd_" + self.nonlinear_type],
+                (2.0 * growth * simps_mu2) * pt_data["Pdt_" + self.nonlinear_type],
+                (growth ** 2 * simps_mu4) * pt_data["Ptt_" + self.nonlinear_type],
+            )
+            self.add_to_cache(self._nonlinear_cache, key, nonlinear, maxsize=32)
+        return self._nonlinear_cache[key]
+
+    def clear_caches(self):
+        """ Empties the per-instance caches, which depend on the cosmology and k values set in `set_data` """
+        super().clear_caches()
+        self._pt_cache = {}
+        self._damping_cache = {}
+        self._fog_cache = {}
+        self._nonlinear_cache = {}
 
     def set_data(self, data):
         super().set_data(data)
-        # Compute the smoothing kernel (assumes a Gaussian smoothing kernel)
+        self.clear_caches()
+
+        # Precompute the powers of k used by the damping terms
+        self._ks2 = self.camb.ks ** 2
+
+        # Scratch buffer for the (nmu, nk) integrand, reused across likelihood calls
+        self._integrand = np.empty((self.nmu, self.camb.ks.size))
+
+        # Compute the smoothing kernel (assumes a Gaussian smoothing kernel), and from it the k dependence of the
+        # Kaiser term so compute_power_spectrum does not need to branch on recon
         if self.recon:
             self.smoothing_kernel = np.exp(-self.camb.ks ** 2 * self.recon_smoothing_scale ** 2 / 2.0)
+            self._kaiser_k = 1.0 - self.smoothing_kernel
+        else:
+            self._kaiser_k = 1.0
 
     def declare_parameters(self):
         super().declare_parameters()
@@ -105,17 +142,51 @@ class PowerNoda2019(PowerSpectrumFit):
             pk_final - The power spectrum at the dilated k-values
         
         """
+        A = np.round(p["A"], decimals=5)
+        pk1d = self.get_fog(A) * self._compute_pk1d_without_fog(p, smooth=smooth)
 
-        # Get the basic power spectrum components
-        ks = self.camb.ks
-        pk_smooth_lin, pk_ratio = self.compute_basic_power_spectrum(p["om"])
+        # A not-a-knot cubic spline through every point is the same interpolant splrep builds with s=0, without the FITPACK knot setup
+        pk_final = CubicSpline(self.camb.ks, pk1d)(k / p["alpha"])
+
+        return pk_final
+
+    def compute_power_spectrum_batched_A(self, k, p, A_values, smooth=False):
+        """ Computes the power spectrum model at k/alpha for several values of the fingers-of-god damping A at once
+
+        The fingers-of-god term is the only part of the model that depends on A and it factors out of the mu integral,
+        so everything else is computed once and shared between the A values.
+
+        Parameters
+        ----------
+        k : np.ndarray
+            Array of wavenumbers to compute
+        p : dict
+            dictionary of parameter names to their values. The value of A, if present, is ignored.
+        A_values : np.ndarray
+            The values of A to compute the power spectrum for. These are rounded to 5 decimals, as in `compute_power_spectrum`
+
+        Returns
+        -------
+        array
+            pk_final - The power spectra at the dilated k-values, with shape (len(A_values), len(k))
+
+        """
+        A_values = np.round(A_values, decimals=5)
+        fog = np.exp(-np.outer(A_values, self._ks2))
+        pk1d = fog * self._compute_pk1d_without_fog(p, smooth=smooth)
+        return CubicSpline(self.camb.ks, pk1d, axis=1)(k / p["alpha"])
 
-        # Compute the growth rate depending on what we have left as free parameters
-        growth = p["f"]
-        gamma = p["gamma"]
+    def _compute_pk1d_without_fog(self, p, smooth=False):
+        """ Computes the mu-averaged power spectrum at the camb ks, excluding the fingers-of-god damping """
+
+        # Read the parameters once, as some are used several times below
+        om, growth, gamma, b = p["om"], p["f"], p["gamma"], p["b"]
+
+        # Get the basic power spectrum components
+        pk_smooth_lin, pk_ratio = self.compute_basic_power_spectrum(om)
 
         # Lets round some things for the sake of numerical speed
-        om = np.round(p["om"], decimals=5)
+        om = np.round(om, decimals=5)
         growth = np.round(growth, decimals=5)
         gamma = np.round(gamma, decimals=5)
 
@@ -123,26 +194,50 @@ class PowerNoda2019(PowerSpectrumFit):
         propagator = self.get_damping(growth, om, gamma)
 
         # Compute the smooth model
-        if self.recon:
-            kaiser_prefac = 1.0 + np.outer(growth / p["b"] * self.mu ** 2, 1.0 - self.smoothing_kernel)
-        else:
-            kaiser_prefac = 1.0 + np.tile(growth / p["b"] * self.mu ** 2, (len(ks), 1)).T
-        fog = np.exp(-p["A"] * ks ** 2)
-        pk_smooth = p["b"] ** 2 * pk_smooth_lin * fog
+        kaiser_prefac = 1.0 + (growth / b * self._mu2)[:, None] * self._kaiser_k
+        pk_smooth = b ** 2 * pk_smooth_lin
 
-        # Compute the non-linear correction to the smooth power spectrum
+        # Compute the non-linear correction to the smooth power spectrum. This is polynomial in mu, so is integrated analytically
         p_dd, p_dt, p_tt = self.get_nonlinear(growth, om)
-        pk_nonlinear = p_dd + p_dt / p["b"] + p_tt / p["b"] ** 2
+        pk_nonlinear = p_dd + p_dt / b + p_tt / b ** 2
 
-        # Integrate over mu
+        # Integrate over mu. The smooth power spectrum is independent of mu so is applied after the integral
+        kaiser_prefac2 = np.square(kaiser_prefac, out=kaiser_prefac)
         if smooth:
-            pk1d = integrate.simps(pk_smooth * ((1.0 + 0.0 * pk_ratio * propagator) * kaiser_prefac ** 2 + pk_nonlinear), self.mu, axis=0)
+            pk1d = pk_smooth * (self._simps_w @ kaiser_prefac2 + pk_nonlinear)
         else:
-            pk1d = integrate.simps(pk_smooth * ((1.0 + pk_ratio * propagator) * kaiser_prefac ** 2 + pk_nonlinear), self.mu, axis=0)
+            # Build (1 + pk_ratio * propagator) * kaiser^2 in place in the scratch buffer
+            integrand = np.multiply(propagator, pk_ratio, out=self._integrand)
+            integrand += 1.0
+            integrand *= kaiser_prefac2
+            pk1d = pk_smooth * (self._simps_w @ integrand + pk_nonlinear)
 
-        pk_final = splev(k / p["alpha"], splrep(ks, pk1d))
+        return pk1d
 
-        return pk_final
+    def get_likelihood_batched_A(self, p, d, A_values):
+        """ Computes the likelihood for several values of the fingers-of-god damping A, sharing all A-independent work
+
+        Parameters
+        ----------
+        p : dict
+            A dictionary of parameter names to parameter values. The value of A, if present, is ignored.
+        d : dict
+            A specific set of data to compute the model for
+        A_values : np.ndarray
+            The values of A to compute the likelihood for
+
+        Returns
+        -------
+        log_likelihoods : np.ndarray
+            The corrected log likelihood for each value of A
+        """
+        pk_generated = self.compute_power_spectrum_batched_A(d["ks_input"], p, A_values, smooth=self.smooth)
+        num_params = len(self.get_active_params())
+        log_likelihoods = np.empty(len(A_values))
+        for i, pk in enumerate(pk_generated):
+            diff = d["pk"] - self.apply_survey_effects(pk, d)
+            log_likelihoods[i] = self.get_chi2_likelihood(diff, d["icov"], num_mocks=d["num_mocks"], num_params=num_params)
+        return log_likelihoods
 
 
 if __name__ == "__main__":
@@ -165,10 +260,10 @@ if __name__ == "__main__":
     model_post = PowerNoda2019(recon=True)
     model_post.set_data(data)
 
-    p = {"om": 0.3, "alpha": 1.0, "A": 7.0, "b": 1.6, "gamma": 4.0}
-    for v in np.linspace(1.0, 20, 20):
-        p["A"] = v
-        print(v, model_post.get_likelihood(p, data[0]))
+    p = {"om": 0.3, "alpha": 1.0, "f": model_post.get_default("f"), "A": 7.0, "b": 1.6, "gamma": 4.0}
+    A_values = np.linspace(1.0, 20, 20)
+    for v, likelihood in zip(A_values, model_post.get_likelihood_batched_A(p, data[0], A_values)):
+        print(v, likelihood)
 
     n = 200
 
@@ -20,6 +20,7 @@ class PowerSeo2016(PowerSpectrumFit):
 
         self.nmu = 100
         self.mu = np.linspace(0.0, 1.0, self.nmu)
+        self._mu2 = self.mu ** 2
         self.smoothing_kernel = None
 
     @lru_cache(maxsize=32)
@@ -28,7 +29,7 @@ class PowerSeo2016(PowerSpectrumFit):
 
     @lru_cache(maxsize=32)
     def get_damping_dd(self, growth, om):
-        return np.exp(-np.outer(1.0 + (2.0 + growth) * growth * self.mu ** 2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma_dd"] / 2.0)
+        return np.exp(-np.outer(1.0 + (2.0 + growth) * growth * self._mu2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma_dd"] / 2.0)
 
     @lru_cache(maxsize=32)
     def get_damping_ss(self, om):
@@ -36,7 +37,7 @@ class PowerSeo2016(PowerSpectrumFit):
 
     @lru_cache(maxsize=32)
     def get_damping(self, growth, om):
-        return np.exp(-np.outer(1.0 + (2.0 + growth) * growth * self.mu ** 2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma"] / 2.0)
+        return np.exp(-np.outer(1.0 + (2.0 + growth) * growth * self._mu2, self.camb.ks ** 2) * self.get_pt_data(om)["sigma"] / 2.0)
 
     def set_data(self, data):
         super().set_data(data)
@@ -92,20 +93,17 @@ class PowerSeo2016(PowerSpectrumFit):
         # Compute the propagator
         if self.recon:
             smooth_prefac = np.tile(self.smoothing_kernel / p["b"], (self.nmu, 1))
-            kaiser_prefac = 1.0 + np.outer(growth / p["b"] * self.mu ** 2, 1.0 - self.smoothing_kernel)
+            kaiser_prefac = 1.0 + np.outer(growth / p["b"] * self._mu2, 1.0 - self.smoothing_kernel)
             propagator = (kaiser_prefac * damping_dd + smooth_prefac * (damping_ss - damping_dd)) ** 2
         else:
-            prefac_k = 1.0 + np.tile(3.0 / 7.0 * (self.get_pt_data(om)["R1"] * (1.0 - 4.0 / (9.0 * p["b"])) + self.get_pt_data(om)["R2"]), (self.nmu, 1))
-            prefac_mu = np.outer(
-                self.mu ** 2,
-                growth / p["b"]
-                + 3.0 / 7.0 * growth * self.get_pt_data(om)["R1"] * (2.0 - 1.0 / (3.0 * p["b"]))
-                + 6.0 / 7.0 * growth * self.get_pt_data(om)["R2"],
-            )
+            pt_data = self.get_pt_data(om)
+            R1, R2 = pt_data["R1"], pt_data["R2"]
+            prefac_k = 1.0 + np.tile(3.0 / 7.0 * (R1 * (1.0 - 4.0 / (9.0 * p["b"])) + R2), (self.nmu, 1))
+            prefac_mu = np.outer(self._mu2, growth / p["b"] + 3.0 / 7.0 * growth * R1 * (2.0 - 1.0 / (3.0 * p["b"])) + 6.0 / 7.0 * growth * R2)
             propagator = ((prefac_k + prefac_mu) * damping) ** 2
 
         # Compute the smooth model
-        fog = 1.0 / (1.0 + np.outer(self.mu ** 2, ks ** 2 * p["sigma_s"] ** 2 / 2.0)) ** 2
+        fog = 1.0 / (1.0 + np.outer(self._mu2, ks ** 2 * p["sigma_s"] ** 2 / 2.0)) ** 2
         pk_smooth = p["b"] ** 2 * pk_smooth_lin * fog
 
         # Polynomial shape
@@ -70,6 +70,30 @@ class Model(ABC):
     def get_name(self):
         return self.name
 
+    def add_to_cache(self, cache, key, value, maxsize):
+        """ Stores a value in one of the model's per-instance cache dicts, evicting the oldest entry first if it is full.
+
+        Parameters
+        ----------
+        cache : dict
+            The cache to store the value in
+        key : hashable
+            The key to store the value under
+        value : object
+            The value to store
+        maxsize : int
+            The maximum number of entries the cache can hold
+
+        Returns
+        -------
+        value : object
+            The stored value
+        """
+        if len(cache) >= maxsize:
+            del cache[next(iter(cache))]
+        cache[key] = value
+        return value
+
     def set_data(self, data):
         if not isinstance(data, list):
             data = [data]
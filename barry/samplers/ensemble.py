@@ -1,12 +1,25 @@
 import logging
+import multiprocessing
 import os
 import numpy as np
 from barry.samplers.hdemcee import EmceeWrapper
 from barry.samplers.sampler import Sampler
 
+# The log posterior each pool worker evaluates, set once per worker so the model is not pickled for every walker
+_worker_log_posterior = None
+
+
+def _set_worker_log_posterior(log_posterior):
+    global _worker_log_posterior
+    _worker_log_posterior = log_posterior
+
+
+def _call_worker_log_posterior(x):
+    return _worker_log_posterior(x)
+
 
 class EnsembleSampler(Sampler):
-    def __init__(self, num_walkers=None, num_steps=1000, num_burn=300, temp_dir=None, save_interval=300):
+    def __init__(self, num_walkers=None, num_steps=1000, num_burn=300, temp_dir=None, save_interval=300, num_processes=None):
         """ Uses ``emcee`` and the `EnsembleSampler
         <http://dan.iel.fm/emcee/current/api/#emcee.EnsembleSampler>`_ to fit the supplied
         model.
@@ -30,6 +43,9 @@ class EnsembleSampler(Sampler):
         save_interval : float
             The amount of seconds between saving the chain to file. Setting to ``None``
             disables serialisation.
+        num_processes : int, optional
+            If greater than one, the walkers' log posteriors are evaluated in parallel
+            over a pool of this many processes. Defaults to serial evaluation.
         """
 
         self.logger = logging.getLogger("barry")
@@ -43,6 +59,7 @@ class EnsembleSampler(Sampler):
             os.makedirs(temp_dir, exist_ok=True)
         self.save_interval = save_interval
         self.num_walkers = num_walkers
+        self.num_processes = num_processes
 
     def fit(self, log_posterior, start, num_dim, prior_transform, save_dims=None, uid=None):
         """ Runs the sampler over the model and returns the flat chain of results
@@ -81,24 +98,32 @@ class EnsembleSampler(Sampler):
         self.logger.debug("Fitting framework with %d dimensions" % num_dim)
 
         self.logger.info("Using Ensemble Sampler")
-        sampler = emcee.EnsembleSampler(self.num_walkers, num_dim, log_posterior, live_dangerously=True)
-
-        emcee_wrapper = EmceeWrapper(sampler)
-        flat_chain = emcee_wrapper.run_chain(
-            self.num_steps,
-            self.num_burn,
-            self.num_walkers,
-            num_dim,
-            start=start,
-            save_dim=save_dims,
-            temp_dir=self.temp_dir,
-            uid=uid,
-            save_interval=self.save_interval,
-        )
-        self.logger.debug("Fit finished")
-        if self.pool is not None:  # pragma: no cover
-            self.pool.close()
-            self.logger.debug("Pool closed")
+        if self.num_processes is not None and self.num_processes > 1:
+            self.logger.info(f"Evaluating walkers over a pool of {self.num_processes} processes")
+            self.pool = multiprocessing.Pool(self.num_processes, initializer=_set_worker_log_posterior, initargs=(log_posterior,))
+            log_posterior = _call_worker_log_posterior
+        try:
+            sampler = emcee.EnsembleSampler(self.num_walkers, num_dim, log_posterior, pool=self.pool, live_dangerously=True)
+
+            emcee_wrapper = EmceeWrapper(sampler)
+            flat_chain = emcee_wrapper.run_chain(
+                self.num_steps,
+                self.num_burn,
+                self.num_walkers,
+                num_dim,
+                start=start,
+                save_dim=save_dims,
+                temp_dir=self.temp_dir,
+                uid=uid,
+                save_interval=self.save_interval,
+            )
+            self.logger.debug("Fit finished")
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()
+                self.pool = None
+                self.logger.debug("Pool closed")
         return {"chain": flat_chain, "weights": np.ones(flat_chain.shape[0])}
 
     def load_file(self, filename):
@@ -2,6 +2,7 @@ from barry.datasets.dummy import DummyCorrelationFunction_SDSS_DR12_Z061_NGC, Du
 from barry.models.model import Model
 from barry.models.bao_power import PowerSpectrumFit
 from barry.models.bao_correlation import CorrelationFunctionFit
+from barry.models.bao_power_Noda2019 import PowerNoda2019
 
 from tests.utils import get_concrete
 import numpy as np
@@ -55,3 +56,13 @@ class TestDataset:
                     params = c.get_raw_start()
                     posterior = c.get_posterior(params)
                     assert np.isfinite(posterior), f"Model {str(c)} at params {params} gave posterior {posterior}"
+
+    def test_noda_batched_A_likelihood_matches_loop(self):
+        for c in self.concrete:
+            if isinstance(c, PowerNoda2019):
+                p = c.get_param_dict(c.get_defaults())
+                d = c.data[0]
+                A_values = np.array([1.234567, 7.891234, 15.5555555])
+                batched = c.get_likelihood_batched_A(p, d, A_values)
+                looped = np.array([c.get_likelihood({**p, "A": A}, d) for A in A_values])
+                assert np.allclose(batched, looped, rtol=1e-10, atol=0), f"Model {str(c)} gave {batched} batched but {looped} looped"
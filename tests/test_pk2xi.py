@@ -32,3 +32,27 @@ class TestPk2Xi:
         ss2_xi = self.ss ** 2 * self.fft(self.ks, self.pk, self.ss)
         diff = np.abs(ss2_xi - self.ss ** 2 * self.xi_truth)
         assert np.all(diff < self.threshold)
+
+    def test_gaussian_matches_trapz(self):
+        from scipy.integrate import trapz
+        from scipy.interpolate import interp1d
+
+        pks2 = interp1d(self.ks, self.pk, kind="linear")(self.gauss.ks2)
+        expected = np.array([trapz(self.gauss.precomp * pks2 * np.sin(self.gauss.ks2 * s) / s, self.gauss.ks2) for s in self.ss])
+        assert np.allclose(self.gauss(self.ks, self.pk, self.ss), expected)
+
+    def test_gaussian_even_distances_recurrence_matches_sin(self):
+        ss = np.linspace(5, 250, 200)
+        self.gauss._fill_sin(ss)
+        assert np.allclose(self.gauss._sin, np.sin(np.outer(ss, self.gauss.ks2)), rtol=0, atol=1e-10)
+
+    def test_gaussian_uneven_distances_match_even(self):
+        ss = np.geomspace(20, 200, 100)
+        xi = self.gauss(self.ks, self.pk, ss)
+        # The last of three evenly spaced distances comes from the recurrence rather than a direct sin evaluation
+        expected = [self.gauss(self.ks, self.pk, np.array([s - 2.0, s - 1.0, s]))[2] for s in ss]
+        assert np.allclose(xi, expected)
+
+    def test_gaussian_float32_input(self):
+        pk32 = self.pk.astype(np.float32)
+        assert np.allclose(self.gauss(self.ks, pk32, self.ss), self.gauss(self.ks, pk32.astype(np.float64), self.ss))
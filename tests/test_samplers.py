@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from barry.samplers import EnsembleSampler
+
+
+def log_posterior(x):
+    return -0.5 * np.sum(x ** 2)
+
+
+def start(num_walkers=None):
+    return np.random.normal(size=(num_walkers, 2))
+
+
+def run_ensemble(temp_dir, num_processes):
+    np.random.seed(0)
+    sampler = EnsembleSampler(num_walkers=8, num_steps=30, num_burn=10, temp_dir=str(temp_dir), num_processes=num_processes)
+    return sampler.fit(log_posterior, start, 2, None, uid="test")["chain"]
+
+
+def test_ensemble_pool_matches_serial(tmp_path):
+    pytest.importorskip("emcee")
+    serial = run_ensemble(tmp_path / "serial", None)
+    pooled = run_ensemble(tmp_path / "pooled", 2)
+    assert serial.shape == (8 * 20, 2)
+    assert np.allclose(serial, pooled)
+
+
+def test_ensemble_pool_closed_on_failure(tmp_path):
+    pytest.importorskip("emcee")
+
+    def bad_start(num_walkers=None):
+        raise RuntimeError("bad start")
+
+    sampler = EnsembleSampler(num_walkers=8, num_steps=30, num_burn=10, temp_dir=str(tmp_path), num_processes=2)
+    with pytest.raises(RuntimeError):
+        sampler.fit(log_posterior, bad_start, 2, None, uid="test")
+    assert sampler.pool is None